@@ -2597,7 +2597,9 @@ class Statement:
     @staticmethod
     def cast(obj):
         if isinstance(obj, Iterable):
-            return _StatementList(list(chain.from_iterable(map(Statement.cast, obj))))
+            # _StatementList extends list, so it materializes the chain directly; an
+            # intermediate list would only be copied again.
+            return _StatementList(chain.from_iterable(map(Statement.cast, obj)))
         else:
             if isinstance(obj, Statement):
                 return _StatementList([obj])
@@ -1,6 +1,4 @@
-from collections import OrderedDict
-from contextlib import contextmanager, _GeneratorContextManager
-from functools import wraps
+from collections import defaultdict, deque
 from enum import Enum
 import warnings
 import sys
@@ -18,6 +16,17 @@ from ._xfrm import *
 __all__ = ["SyntaxError", "SyntaxWarning", "Module"]
 
 
+# Characters legal in a `Case` bit pattern, and a translation table removing the whitespace
+# such a pattern may include.
+_CASE_PATTERN_BITS  = frozenset("01- \t")
+_CASE_PATTERN_STRIP = str.maketrans("", "", " \t")
+
+_PY_LT_312 = sys.version_info < (3, 12)
+
+# Statement kinds that may be appended to a domain with `m.d.<domain> +=`.
+_STATEMENT_TYPES = (Assign, Property, Print, _LateBoundStatement)
+
+
 class SyntaxError(Exception):
     pass
 
@@ -32,10 +41,17 @@ class _ModuleBuilderProxy:
         object.__setattr__(self, "_depth", depth)
 
 
-class _ModuleBuilderDomain(_ModuleBuilderProxy):
-    def __init__(self, builder, depth, domain):
-        super().__init__(builder, depth)
-        self._domain = domain
+class _ModuleBuilderDomain:
+    def __init__(self, builder, domains, domain):
+        object.__setattr__(self, "_builder", builder)
+        object.__setattr__(self, "_domains", domains)
+        object.__setattr__(self, "_domain", domain)
+
+    @property
+    def _depth(self):
+        # These proxies are cached and outlive the control block they were first used in,
+        # so the depth has to be read from the parent at use time.
+        return self._domains._depth
 
     def __iadd__(self, assigns):
         self._builder._add_statement(assigns, domain=self._domain, depth=self._depth)
@@ -43,13 +59,20 @@ class _ModuleBuilderDomain(_ModuleBuilderProxy):
 
 
 class _ModuleBuilderDomains(_ModuleBuilderProxy):
+    def __init__(self, builder, depth):
+        super().__init__(builder, depth)
+        object.__setattr__(self, "_cache", {})
+
     def __getattr__(self, name):
         if name == "submodules":
             warnings.warn("Using '<module>.d.{}' would add statements to clock domain {!r}; "
                           "did you mean <module>.{} instead?"
                           .format(name, name, name),
                           SyntaxWarning, stacklevel=2)
-        return _ModuleBuilderDomain(self._builder, self._depth, name)
+        domain = self._cache.get(name)
+        if domain is None:
+            domain = self._cache[name] = _ModuleBuilderDomain(self._builder, self, name)
+        return domain
 
     def __getitem__(self, name):
         return self.__getattr__(name)
@@ -89,12 +112,16 @@ class _ModuleBuilderSubmodules:
         return self
 
     def __setattr__(self, name, submodule):
-        src_loc = tracer.get_src_loc()
-        self._builder._add_submodule(submodule, name, src_loc=src_loc)
+        # Capture the caller's frame directly; equivalent to `tracer.get_src_loc()` with one
+        # less frame walked, which adds up when many submodules are added.
+        frame = sys._getframe(1)
+        self._builder._add_submodule(submodule, name,
+                                     src_loc=(frame.f_code.co_filename, frame.f_lineno))
 
     def __setitem__(self, name, submodule):
-        src_loc = tracer.get_src_loc()
-        self._builder._add_submodule(submodule, name, src_loc=src_loc)
+        frame = sys._getframe(1)
+        self._builder._add_submodule(submodule, name,
+                                     src_loc=(frame.f_code.co_filename, frame.f_lineno))
 
     def __getattr__(self, name):
         return self._builder._get_submodule(name)
@@ -126,25 +153,357 @@ class _ModuleBuilderDomainSet:
         self._builder._add_domain(domain)
 
 
-# It's not particularly clean to depend on an internal interface, but, unfortunately, __bool__
-# must be defined on a class to be called during implicit conversion.
-class _GuardedContextManager(_GeneratorContextManager):
-    def __init__(self, keyword, func, args, kwds):
-        self.keyword = keyword
-        return super().__init__(func, args, kwds)
+# The `with m.<Ctrl>(...):` context managers are implemented as plain __enter__/__exit__
+# classes rather than @contextmanager generators: entering a generator context manager costs
+# a generator object plus two iterator protocol calls per block, which adds up quickly for the
+# fine-grained blocks HDL code is made of. All of the work happens in __enter__/__exit__, so
+# merely calling e.g. `m.If(cond)` without entering the block has no effect, same as before.
+class _ControlContext:
+    __slots__ = ("_module",)
 
+
+class _GuardedControlContext(_ControlContext):
+    __slots__ = ()
+    keyword = None
+
+    # __bool__ must be defined on a class to be called during implicit conversion.
     def __bool__(self):
         raise SyntaxError("`if m.{kw}(...):` does not work; use `with m.{kw}(...)`"
                           .format(kw=self.keyword))
 
 
-def _guardedcontextmanager(keyword):
-    def decorator(func):
-        @wraps(func)
-        def helper(*args, **kwds):
-            return _GuardedContextManager(keyword, func, args, kwds)
-        return helper
-    return decorator
+class _IfContext(_GuardedControlContext):
+    __slots__ = ("_cond", "_src_loc", "_if_data", "_outer")
+    keyword = "If"
+
+    def __init__(self, module, cond):
+        self._module = module
+        self._cond = cond
+
+    def __enter__(self):
+        m = self._module
+        m._check_context("If", context=None)
+        self._cond = m._check_signed_cond(self._cond)
+        frame = sys._getframe(1)
+        src_loc = self._src_loc = (frame.f_code.co_filename, frame.f_lineno)
+        _dom = m.domain
+        self._if_data = m._set_ctrl("If", {
+            "depth":    _dom._depth,
+            "tests":    [],
+            "bodies":   [],
+            "src_loc":  src_loc,
+            "src_locs": [],
+        })
+        self._outer = m._statements
+        m._statements = defaultdict(list)
+        _dom._depth += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        m = self._module
+        try:
+            if exc_type is None:
+                m._flush_ctrl()
+                if_data = self._if_data
+                if_data["tests"].append(self._cond)
+                if_data["bodies"].append(m._statements)
+                if_data["src_locs"].append(self._src_loc)
+        finally:
+            m.domain._depth -= 1
+            m._statements = self._outer
+
+
+class _ElifContext(_GuardedControlContext):
+    __slots__ = ("_cond", "_src_loc", "_if_data", "_outer")
+    keyword = "Elif"
+
+    def __init__(self, module, cond):
+        self._module = module
+        self._cond = cond
+
+    def __enter__(self):
+        m = self._module
+        m._check_context("Elif", context=None)
+        self._cond = m._check_signed_cond(self._cond)
+        frame = sys._getframe(1)
+        self._src_loc = (frame.f_code.co_filename, frame.f_lineno)
+        _dom = m.domain
+        if_data = self._if_data = m._get_ctrl("If")
+        if if_data is None or if_data["depth"] != _dom._depth:
+            raise SyntaxError("Elif without preceding If")
+        self._outer = m._statements
+        m._statements = defaultdict(list)
+        _dom._depth += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        m = self._module
+        try:
+            if exc_type is None:
+                m._flush_ctrl()
+                if_data = self._if_data
+                if_data["tests"].append(self._cond)
+                if_data["bodies"].append(m._statements)
+                if_data["src_locs"].append(self._src_loc)
+        finally:
+            m.domain._depth -= 1
+            m._statements = self._outer
+
+
+class _ElseContext(_GuardedControlContext):
+    __slots__ = ("_src_loc", "_if_data", "_outer")
+    keyword = "Else"
+
+    def __init__(self, module):
+        self._module = module
+
+    def __enter__(self):
+        m = self._module
+        m._check_context("Else", context=None)
+        frame = sys._getframe(1)
+        self._src_loc = (frame.f_code.co_filename, frame.f_lineno)
+        _dom = m.domain
+        if_data = self._if_data = m._get_ctrl("If")
+        if if_data is None or if_data["depth"] != _dom._depth:
+            raise SyntaxError("Else without preceding If/Elif")
+        self._outer = m._statements
+        m._statements = defaultdict(list)
+        _dom._depth += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        m = self._module
+        try:
+            if exc_type is None:
+                m._flush_ctrl()
+                if_data = self._if_data
+                if_data["bodies"].append(m._statements)
+                if_data["src_locs"].append(self._src_loc)
+        finally:
+            m.domain._depth -= 1
+            m._statements = self._outer
+        if exc_type is None:
+            m._pop_ctrl()
+
+
+class _SwitchContext(_ControlContext):
+    __slots__ = ("_test",)
+
+    def __init__(self, module, test):
+        self._module = module
+        self._test = test
+
+    def __enter__(self):
+        m = self._module
+        m._check_context("Switch", context=None)
+        frame = sys._getframe(1)
+        m._set_ctrl("Switch", {
+            "test":    Value.cast(self._test),
+            "cases":   {},
+            "src_loc": (frame.f_code.co_filename, frame.f_lineno),
+            "case_src_locs": {},
+        })
+        m._ctrl_context = "Switch"
+        m.domain._depth += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        m = self._module
+        m.domain._depth -= 1
+        m._ctrl_context = None
+        if exc_type is None:
+            m._pop_ctrl()
+
+
+class _CaseContext(_ControlContext):
+    __slots__ = ("_patterns", "_new_patterns", "_switch_data", "_src_loc", "_outer")
+
+    def __init__(self, module, patterns):
+        self._module = module
+        self._patterns = patterns
+
+    def __enter__(self):
+        m = self._module
+        m._check_context("Case", context="Switch")
+        frame = sys._getframe(1)
+        self._src_loc = (frame.f_code.co_filename, frame.f_lineno)
+        switch_data = self._switch_data = m._get_ctrl("Switch")
+        # Accumulate in a list: rebuilding a tuple per pattern is quadratic in pattern count.
+        new_patterns = []
+        if () in switch_data["cases"]:
+            warnings.warn("A case defined after the default case will never be active",
+                          SyntaxWarning, stacklevel=2)
+        # This code should accept exactly the same patterns as `v.matches(...)`.
+        test_len = len(switch_data["test"])
+        for pattern in self._patterns:
+            if isinstance(pattern, str):
+                if not _CASE_PATTERN_BITS.issuperset(pattern):
+                    raise SyntaxError("Case pattern '{}' must consist of 0, 1, and - (don't care) "
+                                      "bits, and may include whitespace"
+                                      .format(pattern))
+                if len(pattern.translate(_CASE_PATTERN_STRIP)) != test_len:
+                    raise SyntaxError("Case pattern '{}' must have the same width as switch value "
+                                      "(which is {})"
+                                      .format(pattern, test_len))
+                new_patterns.append(pattern)
+            else:
+                try:
+                    orig_pattern, pattern = pattern, Const.cast(pattern)
+                except TypeError as e:
+                    raise SyntaxError("Case pattern must be a string or a constant-castable "
+                                      "expression, not {!r}"
+                                      .format(pattern)) from e
+                pattern_len = bits_for(pattern.value) if pattern.value else 0
+                if pattern_len > test_len:
+                    warnings.warn("Case pattern '{!r}' ({}'{:b}) is wider than switch value "
+                                  "(which has width {}); comparison will never be true"
+                                  .format(orig_pattern, pattern_len, pattern.value, test_len),
+                                  SyntaxWarning, stacklevel=2)
+                    continue
+                new_patterns.append(pattern.value)
+        self._new_patterns = tuple(new_patterns)
+        self._outer = m._statements
+        m._statements = defaultdict(list)
+        m._ctrl_context = None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        m = self._module
+        try:
+            if exc_type is None:
+                m._flush_ctrl()
+                new_patterns = self._new_patterns
+                switch_data = self._switch_data
+                # If none of the provided cases can possibly be true, omit this branch
+                # completely. Likewise, omit this branch if another branch with this exact set
+                # of patterns already exists (since otherwise we'd overwrite the previous
+                # branch's slot in the dict).
+                if new_patterns and new_patterns not in switch_data["cases"]:
+                    switch_data["cases"][new_patterns] = m._statements
+                    switch_data["case_src_locs"][new_patterns] = self._src_loc
+        finally:
+            m._ctrl_context = "Switch"
+            m._statements = self._outer
+
+
+class _DefaultContext(_ControlContext):
+    __slots__ = ("_switch_data", "_src_loc", "_outer")
+
+    def __init__(self, module):
+        self._module = module
+
+    def __enter__(self):
+        m = self._module
+        m._check_context("Default", context="Switch")
+        frame = sys._getframe(1)
+        self._src_loc = (frame.f_code.co_filename, frame.f_lineno)
+        switch_data = self._switch_data = m._get_ctrl("Switch")
+        if () in switch_data["cases"]:
+            warnings.warn("A case defined after the default case will never be active",
+                          SyntaxWarning, stacklevel=2)
+        self._outer = m._statements
+        m._statements = defaultdict(list)
+        m._ctrl_context = None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        m = self._module
+        try:
+            if exc_type is None:
+                m._flush_ctrl()
+                switch_data = self._switch_data
+                if () not in switch_data["cases"]:
+                    switch_data["cases"][()] = m._statements
+                    switch_data["case_src_locs"][()] = self._src_loc
+        finally:
+            m._ctrl_context = "Switch"
+            m._statements = self._outer
+
+
+class _FSMContext(_ControlContext):
+    __slots__ = ("_init", "_domain", "_name", "_reset", "_fsm_data", "_fsm")
+
+    def __init__(self, module, init, domain, name, reset):
+        self._module = module
+        self._init = init
+        self._domain = domain
+        self._name = name
+        self._reset = reset
+
+    def __enter__(self):
+        m = self._module
+        m._check_context("FSM", context=None)
+        init, domain, name = self._init, self._domain, self._name
+        if domain == "comb":
+            raise ValueError(f"FSM may not be driven by the '{domain}' domain")
+        # TODO(amaranth-0.7): remove
+        if self._reset is not None:
+            if init is not None:
+                raise ValueError("Cannot specify both `reset` and `init`")
+            warnings.warn("`reset=` is deprecated, use `init=` instead",
+                          DeprecationWarning, stacklevel=2)
+            init = self._reset
+        frame = sys._getframe(1)
+        fsm_data = self._fsm_data = m._set_ctrl("FSM", {
+            "name":     name,
+            "init":     init,
+            "domain":   domain,
+            "encoding": {},
+            "decoding": {},
+            "ongoing":  {},
+            "states":   {},
+            "src_loc":  (frame.f_code.co_filename, frame.f_lineno),
+            "state_src_locs": {},
+        })
+        m._generated[name] = fsm = self._fsm = FSM(m, fsm_data)
+        m._ctrl_context = "FSM"
+        m.domain._depth += 1
+        return fsm
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        m = self._module
+        fsm_data = self._fsm_data
+        try:
+            if exc_type is None:
+                for state_name in fsm_data["encoding"]:
+                    if state_name not in fsm_data["states"]:
+                        raise NameError("FSM state '{}' is referenced but not defined"
+                                        .format(state_name))
+        finally:
+            m.domain._depth -= 1
+            m._ctrl_context = None
+        if exc_type is None:
+            m._pop_ctrl()
+            self._fsm.state = fsm_data["signal"]
+
+
+class _StateContext(_ControlContext):
+    __slots__ = ("_name", "_fsm_data", "_src_loc", "_outer")
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+
+    def __enter__(self):
+        m = self._module
+        m._check_context("FSM State", context="FSM")
+        frame = sys._getframe(1)
+        self._src_loc = (frame.f_code.co_filename, frame.f_lineno)
+        fsm_data = self._fsm_data = m._get_ctrl("FSM")
+        name = self._name
+        if name in fsm_data["states"]:
+            raise NameError(f"FSM state '{name}' is already defined")
+        if name not in fsm_data["encoding"]:
+            fsm_data["encoding"][name] = len(fsm_data["encoding"])
+        self._outer = m._statements
+        m._statements = defaultdict(list)
+        m._ctrl_context = None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        m = self._module
+        try:
+            if exc_type is None:
+                m._flush_ctrl()
+                fsm_data = self._fsm_data
+                fsm_data["states"][self._name] = m._statements
+                fsm_data["state_src_locs"][self._name] = self._src_loc
+        finally:
+            m._ctrl_context = "FSM"
+            m._statements = self._outer
 
 
 class FSMNextStatement(_LateBoundStatement):
@@ -158,7 +517,8 @@ class FSMNextStatement(_LateBoundStatement):
 
 
 class FSM:
-    def __init__(self, data):
+    def __init__(self, module, data):
+        self._module  = module
         self._data    = data
         self.encoding = data["encoding"]
         self.decoding = data["decoding"]
@@ -166,24 +526,60 @@ class FSM:
     def ongoing(self, name):
         if name not in self.encoding:
             self.encoding[name] = len(self.encoding)
-            fsm_name = self._data["name"]
-            self._data["ongoing"][name] = Signal(name="")
-        return self._data["ongoing"][name]
+        # The signal is created only when a state is actually queried; states that are merely
+        # defined or jumped to do not pay for a signal and its comb driver.
+        ongoing = self._data["ongoing"]
+        sig = ongoing.get(name)
+        if sig is None:
+            sig = ongoing[name] = Signal(name="")
+            fsm_signal = self._data.get("signal")
+            if fsm_signal is not None:
+                # The FSM has already been finalized; drive the new signal directly.
+                self._module._top_comb_statements.append(
+                    sig.eq(Operator("==", [fsm_signal, self.encoding[name]], src_loc_at=0)))
+        return sig
+
+
+def _resolve_switch(root):
+    # Phase 1: walk the Switch tree breadth-first, resolving late bound statements along the way
+    # and collecting every nested Switch. Iterating with an explicit worklist keeps arbitrarily
+    # deep Switch nesting from exhausting the interpreter stack.
+    order = []
+    worklist = deque((root,))
+    while worklist:
+        switch = worklist.popleft()
+        cases = {}
+        for patterns, stmts in switch.cases.items():
+            case_stmts = []
+            for stmt in stmts:
+                while isinstance(stmt, _LateBoundStatement):
+                    stmt = stmt.resolve()
+                if isinstance(stmt, Switch):
+                    worklist.append(stmt)
+                elif not isinstance(stmt, (Assign, Property, Print)):
+                    assert False # :nocov:
+                case_stmts.append(stmt)
+            cases[patterns] = case_stmts
+        order.append((switch, cases))
+    # Phase 2: rebuild the switches innermost-first, so that every nested Switch is rebuilt
+    # before the Switch that contains it.
+    rebuilt = {}
+    for switch, cases in reversed(order):
+        rebuilt[id(switch)] = Switch(
+            test=switch.test,
+            cases={patterns: [rebuilt.get(id(stmt), stmt) for stmt in stmts]
+                   for patterns, stmts in cases.items()},
+            src_loc=switch.src_loc,
+            case_src_locs=switch.case_src_locs,
+        )
+    return rebuilt[id(root)]
 
 
 def resolve_statement(stmt):
-    if isinstance(stmt, _LateBoundStatement):
-        return resolve_statement(stmt.resolve())
-    elif isinstance(stmt, Switch):
-        return Switch(
-            test=stmt.test,
-            cases=OrderedDict(
-                (patterns, resolve_statements(stmts))
-                for patterns, stmts in stmt.cases.items()
-            ),
-            src_loc=stmt.src_loc,
-            case_src_locs=stmt.case_src_locs,
-        )
+    while isinstance(stmt, _LateBoundStatement):
+        stmt = stmt.resolve()
+    if isinstance(stmt, Switch):
+        return _resolve_switch(stmt)
     elif isinstance(stmt, (Assign, Property, Print)):
         return stmt
     else:
@@ -191,7 +587,7 @@ def resolve_statement(stmt):
 
 
 def resolve_statements(stmts):
-    return _StatementList(resolve_statement(stmt) for stmt in stmts)
+    return _StatementList([resolve_statement(stmt) for stmt in stmts])
 
 
 class Module(_ModuleBuilderRoot, Elaboratable):
@@ -205,12 +601,15 @@ class Module(_ModuleBuilderRoot, Elaboratable):
         self.submodules    = _ModuleBuilderSubmodules(self)
         self.domains       = _ModuleBuilderDomainSet(self)
 
-        self._statements   = {}
+        self._statements   = defaultdict(list)
         self._ctrl_context = None
         self._ctrl_stack   = []
         self._top_comb_statements = _StatementList()
 
         self._driving      = SignalDict()
+        # Mirror of `_driving` keyed by `id(signal)`, used as the membership fast path in
+        # `_add_statement`; `_driving` itself keeps the signals alive, making the ids stable.
+        self._driving_ids  = {}
         self._named_submodules = {}
         self._anon_submodules  = []
         self._domains      = {}
@@ -239,8 +638,10 @@ class Module(_ModuleBuilderRoot, Elaboratable):
                 return top_data
 
     def _flush_ctrl(self):
-        while len(self._ctrl_stack) > self.domain._depth:
-            self._pop_ctrl()
+        # Most flushes find nothing to pop; check once before entering the popping loop.
+        depth = self.domain._depth
+        if len(self._ctrl_stack) > depth:
+            self._pop_ctrl_to(depth)
 
     def _set_ctrl(self, name, data):
         self._flush_ctrl()
@@ -248,231 +649,42 @@ class Module(_ModuleBuilderRoot, Elaboratable):
         return data
 
     def _check_signed_cond(self, cond):
+        if type(cond) is Signal and not cond._signed:
+            # The common case: an unsigned Signal needs neither casting nor the signedness check.
+            return cond
         cond = Value.cast(cond)
-        if sys.version_info < (3, 12, 0) and cond.shape().signed:
+        if _PY_LT_312 and cond.shape().signed:
             # TODO(py3.11): remove; ~True is a warning in 3.12+, finally!
             warnings.warn("Signed values in If/Elif conditions usually result from inverting "
                           "Python booleans with ~, which leads to unexpected results. "
                           "Replace `~flag` with `not flag`. (If this is a false positive, "
                           "silence this warning with `m.If(x)` → `m.If(x.bool())`.)",
-                          SyntaxWarning, stacklevel=4)
+                          SyntaxWarning, stacklevel=3)
         return cond
 
-    @_guardedcontextmanager("If")
     def If(self, cond):
-        self._check_context("If", context=None)
-        cond = self._check_signed_cond(cond)
-        src_loc = tracer.get_src_loc(src_loc_at=1)
-        if_data = self._set_ctrl("If", {
-            "depth":    self.domain._depth,
-            "tests":    [],
-            "bodies":   [],
-            "src_loc":  src_loc,
-            "src_locs": [],
-        })
-        try:
-            _outer_case, self._statements = self._statements, {}
-            self.domain._depth += 1
-            yield
-            self._flush_ctrl()
-            if_data["tests"].append(cond)
-            if_data["bodies"].append(self._statements)
-            if_data["src_locs"].append(src_loc)
-        finally:
-            self.domain._depth -= 1
-            self._statements = _outer_case
+        return _IfContext(self, cond)
 
-    @_guardedcontextmanager("Elif")
     def Elif(self, cond):
-        self._check_context("Elif", context=None)
-        cond = self._check_signed_cond(cond)
-        src_loc = tracer.get_src_loc(src_loc_at=1)
-        if_data = self._get_ctrl("If")
-        if if_data is None or if_data["depth"] != self.domain._depth:
-            raise SyntaxError("Elif without preceding If")
-        try:
-            _outer_case, self._statements = self._statements, {}
-            self.domain._depth += 1
-            yield
-            self._flush_ctrl()
-            if_data["tests"].append(cond)
-            if_data["bodies"].append(self._statements)
-            if_data["src_locs"].append(src_loc)
-        finally:
-            self.domain._depth -= 1
-            self._statements = _outer_case
+        return _ElifContext(self, cond)
 
-    @_guardedcontextmanager("Else")
     def Else(self):
-        self._check_context("Else", context=None)
-        src_loc = tracer.get_src_loc(src_loc_at=1)
-        if_data = self._get_ctrl("If")
-        if if_data is None or if_data["depth"] != self.domain._depth:
-            raise SyntaxError("Else without preceding If/Elif")
-        try:
-            _outer_case, self._statements = self._statements, {}
-            self.domain._depth += 1
-            yield
-            self._flush_ctrl()
-            if_data["bodies"].append(self._statements)
-            if_data["src_locs"].append(src_loc)
-        finally:
-            self.domain._depth -= 1
-            self._statements = _outer_case
-        self._pop_ctrl()
+        return _ElseContext(self)
 
-    @contextmanager
     def Switch(self, test):
-        self._check_context("Switch", context=None)
-        switch_data = self._set_ctrl("Switch", {
-            "test":    Value.cast(test),
-            "cases":   OrderedDict(),
-            "src_loc": tracer.get_src_loc(src_loc_at=1),
-            "case_src_locs": {},
-        })
-        try:
-            self._ctrl_context = "Switch"
-            self.domain._depth += 1
-            yield
-        finally:
-            self.domain._depth -= 1
-            self._ctrl_context = None
-        self._pop_ctrl()
+        return _SwitchContext(self, test)
 
-    @contextmanager
     def Case(self, *patterns):
-        self._check_context("Case", context="Switch")
-        src_loc = tracer.get_src_loc(src_loc_at=1)
-        switch_data = self._get_ctrl("Switch")
-        new_patterns = ()
-        if () in switch_data["cases"]:
-            warnings.warn("A case defined after the default case will never be active",
-                          SyntaxWarning, stacklevel=3)
-        # This code should accept exactly the same patterns as `v.matches(...)`.
-        for pattern in patterns:
-            if isinstance(pattern, str) and any(bit not in "01- \t" for bit in pattern):
-                raise SyntaxError("Case pattern '{}' must consist of 0, 1, and - (don't care) "
-                                  "bits, and may include whitespace"
-                                  .format(pattern))
-            if (isinstance(pattern, str) and
-                    len("".join(pattern.split())) != len(switch_data["test"])):
-                raise SyntaxError("Case pattern '{}' must have the same width as switch value "
-                                  "(which is {})"
-                                  .format(pattern, len(switch_data["test"])))
-            if isinstance(pattern, str):
-                new_patterns = (*new_patterns, pattern)
-            else:
-                try:
-                    orig_pattern, pattern = pattern, Const.cast(pattern)
-                except TypeError as e:
-                    raise SyntaxError("Case pattern must be a string or a constant-castable "
-                                      "expression, not {!r}"
-                                      .format(pattern)) from e
-                pattern_len = bits_for(pattern.value)
-                if pattern.value == 0:
-                    pattern_len = 0
-                if pattern_len > len(switch_data["test"]):
-                    warnings.warn("Case pattern '{!r}' ({}'{:b}) is wider than switch value "
-                                  "(which has width {}); comparison will never be true"
-                                  .format(orig_pattern, pattern_len, pattern.value,
-                                          len(switch_data["test"])),
-                                  SyntaxWarning, stacklevel=3)
-                    continue
-                new_patterns = (*new_patterns, pattern.value)
-        try:
-            _outer_case, self._statements = self._statements, {}
-            self._ctrl_context = None
-            yield
-            self._flush_ctrl()
-            # If none of the provided cases can possibly be true, omit this branch completely.
-            # Likewise, omit this branch if another branch with this exact set of patterns already
-            # exists (since otherwise we'd overwrite the previous branch's slot in the dict).
-            if new_patterns and new_patterns not in switch_data["cases"]:
-                switch_data["cases"][new_patterns] = self._statements
-                switch_data["case_src_locs"][new_patterns] = src_loc
-        finally:
-            self._ctrl_context = "Switch"
-            self._statements = _outer_case
+        return _CaseContext(self, patterns)
 
-    @contextmanager
     def Default(self):
-        self._check_context("Default", context="Switch")
-        src_loc = tracer.get_src_loc(src_loc_at=1)
-        switch_data = self._get_ctrl("Switch")
-        if () in switch_data["cases"]:
-            warnings.warn("A case defined after the default case will never be active",
-                          SyntaxWarning, stacklevel=3)
-        try:
-            _outer_case, self._statements = self._statements, {}
-            self._ctrl_context = None
-            yield
-            self._flush_ctrl()
-            if () not in switch_data["cases"]:
-                switch_data["cases"][()] = self._statements
-                switch_data["case_src_locs"][()] = src_loc
-        finally:
-            self._ctrl_context = "Switch"
-            self._statements = _outer_case
+        return _DefaultContext(self)
 
-    @contextmanager
     def FSM(self, init=None, domain="sync", name="fsm", *, reset=None):
-        self._check_context("FSM", context=None)
-        if domain == "comb":
-            raise ValueError(f"FSM may not be driven by the '{domain}' domain")
-        # TODO(amaranth-0.7): remove
-        if reset is not None:
-            if init is not None:
-                raise ValueError("Cannot specify both `reset` and `init`")
-            warnings.warn("`reset=` is deprecated, use `init=` instead",
-                          DeprecationWarning, stacklevel=2)
-            init = reset
-        fsm_data = self._set_ctrl("FSM", {
-            "name":     name,
-            "init":     init,
-            "domain":   domain,
-            "encoding": OrderedDict(),
-            "decoding": OrderedDict(),
-            "ongoing":  {},
-            "states":   OrderedDict(),
-            "src_loc":  tracer.get_src_loc(src_loc_at=1),
-            "state_src_locs": {},
-        })
-        self._generated[name] = fsm = FSM(fsm_data)
-        try:
-            self._ctrl_context = "FSM"
-            self.domain._depth += 1
-            yield fsm
-            for state_name in fsm_data["encoding"]:
-                if state_name not in fsm_data["states"]:
-                    raise NameError("FSM state '{}' is referenced but not defined"
-                                    .format(state_name))
-        finally:
-            self.domain._depth -= 1
-            self._ctrl_context = None
-        self._pop_ctrl()
-        fsm.state = fsm_data["signal"]
+        return _FSMContext(self, init, domain, name, reset)
 
-    @contextmanager
     def State(self, name):
-        self._check_context("FSM State", context="FSM")
-        src_loc = tracer.get_src_loc(src_loc_at=1)
-        fsm_data = self._get_ctrl("FSM")
-        if name in fsm_data["states"]:
-            raise NameError(f"FSM state '{name}' is already defined")
-        if name not in fsm_data["encoding"]:
-            fsm_name = fsm_data["name"]
-            fsm_data["encoding"][name] = len(fsm_data["encoding"])
-            fsm_data["ongoing"][name] = Signal(name="")
-        try:
-            _outer_case, self._statements = self._statements, {}
-            self._ctrl_context = None
-            yield
-            self._flush_ctrl()
-            fsm_data["states"][name] = self._statements
-            fsm_data["state_src_locs"][name] = src_loc
-        finally:
-            self._ctrl_context = "FSM"
-            self._statements = _outer_case
+        return _StateContext(self, name)
 
     @property
     def next(self):
@@ -484,9 +696,7 @@ class Module(_ModuleBuilderRoot, Elaboratable):
             for level, (ctrl_name, ctrl_data) in enumerate(reversed(self._ctrl_stack)):
                 if ctrl_name == "FSM":
                     if name not in ctrl_data["encoding"]:
-                        fsm_name = ctrl_data["name"]
                         ctrl_data["encoding"][name] = len(ctrl_data["encoding"])
-                        ctrl_data["ongoing"][name] = Signal(name="")
                     self._add_statement(
                         assigns=[FSMNextStatement(ctrl_data, name)],
                         domain=ctrl_data["domain"],
@@ -497,110 +707,158 @@ class Module(_ModuleBuilderRoot, Elaboratable):
 
     def _pop_ctrl(self):
         name, data = self._ctrl_stack.pop()
+        self._CTRL_FINALIZERS[name](self, data)
+
+    def _pop_ctrl_to(self, depth):
+        stack = self._ctrl_stack
+        finalizers = self._CTRL_FINALIZERS
+        while len(stack) > depth:
+            name, data = stack.pop()
+            finalizers[name](self, data)
+
+    def _finish_if(self, data):
+        src_loc = data["src_loc"]
+        if_tests, if_bodies = data["tests"], data["bodies"]
+        if_src_locs = data["src_locs"]
+
+        tests, matches = [], []
+        for index, if_test in enumerate(if_tests):
+            if len(if_test) != 1:
+                if_test = if_test.bool()
+            tests.append(if_test)
+            matches.append(("1" + "-" * index).rjust(len(if_tests), "-"))
+        if len(if_bodies) > len(if_tests):
+            # The final body belongs to an Else branch; it matches when no test does.
+            matches.append(None)
+
+        # Group the bodies by domain in a single pass; dict iteration order keeps both
+        # the domains and the cases within each domain deterministic.
+        per_domain = {}
+        for match, if_case in zip(matches, if_bodies):
+            for domain, stmts in if_case.items():
+                per_domain.setdefault(domain, {})[match] = stmts
+
+        for domain, cases in per_domain.items():
+            if len(cases) != len(matches):
+                # This domain is not driven from every branch; fill the rest with empty cases.
+                cases = {match: cases.get(match, []) for match in matches}
+
+            self._statements[domain].append(Switch(Cat(tests), cases,
+                src_loc=src_loc, case_src_locs=dict(zip(cases, if_src_locs))))
+
+    def _finish_switch(self, data):
         src_loc = data["src_loc"]
+        switch_test, switch_cases = data["test"], data["cases"]
+        switch_case_src_locs = data["case_src_locs"]
 
-        if name == "If":
-            if_tests, if_bodies = data["tests"], data["bodies"]
-            if_src_locs = data["src_locs"]
-
-            # Use dict to ensure deterministic iteration.
-            domains = {}
-            for if_case in if_bodies:
-                for domain in if_case:
-                    domains[domain] = None
-
-            for domain in domains:
-                tests, cases = [], OrderedDict()
-                for if_test, if_case in zip(if_tests + [None], if_bodies):
-                    if if_test is not None:
-                        if len(if_test) != 1:
-                            if_test = if_test.bool()
-                        tests.append(if_test)
-
-                    if if_test is not None:
-                        match = ("1" + "-" * (len(tests) - 1)).rjust(len(if_tests), "-")
-                    else:
-                        match = None
-                    cases[match] = if_case.get(domain, [])
-
-                self._statements.setdefault(domain, []).append(Switch(Cat(tests), cases,
-                    src_loc=src_loc, case_src_locs=dict(zip(cases, if_src_locs))))
-
-        if name == "Switch":
-            switch_test, switch_cases = data["test"], data["cases"]
-            switch_case_src_locs = data["case_src_locs"]
-
-            domains = {}
-            for stmts in switch_cases.values():
-                for domain in stmts:
-                    domains[domain] = None
-
-            for domain in domains:
-                domain_cases = OrderedDict()
-                for patterns, stmts in switch_cases.items():
-                    domain_cases[patterns] = stmts.get(domain, [])
-
-                self._statements.setdefault(domain, []).append(Switch(switch_test, domain_cases,
-                    src_loc=src_loc, case_src_locs=switch_case_src_locs))
-
-        if name == "FSM":
-            fsm_name, fsm_init, fsm_encoding, fsm_decoding, fsm_states, fsm_ongoing = \
-                data["name"], data["init"], data["encoding"], data["decoding"], data["states"], data["ongoing"]
-            fsm_state_src_locs = data["state_src_locs"]
-            if not fsm_states:
-                data["signal"] = Signal(0, name=f"{fsm_name}_state", src_loc_at=2)
-                return
-            if fsm_init is None:
-                init = fsm_encoding[next(iter(fsm_states))]
-            else:
-                init = fsm_encoding[fsm_init]
-            # The FSM is encoded such that the state with encoding 0 is always the init state.
-            fsm_decoding.update((n, s) for s, n in fsm_encoding.items())
-            data["signal"] = fsm_signal = Signal(range(len(fsm_encoding)), init=init,
-                                                 name=f"{fsm_name}_state", src_loc_at=2,
-                                                 decoder=lambda n: f"{fsm_decoding[n]}/{n}")
-
-            for name, sig in fsm_ongoing.items():
-                self._top_comb_statements.append(
-                    sig.eq(Operator("==", [fsm_signal, fsm_encoding[name]], src_loc_at=0)))
-
-            domains = {}
-            for stmts in fsm_states.values():
-                for domain in stmts:
-                    domains[domain] = None
-
-            for domain in domains:
-                domain_states = OrderedDict()
-                for state, stmts in fsm_states.items():
-                    domain_states[state] = stmts.get(domain, [])
-
-                self._statements.setdefault(domain, []).append(Switch(fsm_signal,
-                    OrderedDict((fsm_encoding[name], stmts) for name, stmts in domain_states.items()),
-                    src_loc=src_loc, case_src_locs={fsm_encoding[name]: fsm_state_src_locs[name]
-                                                    for name in fsm_states}))
+        per_domain = {}
+        for patterns, stmts in switch_cases.items():
+            for domain, domain_stmts in stmts.items():
+                per_domain.setdefault(domain, {})[patterns] = domain_stmts
 
-    def _add_statement(self, assigns, domain, depth):
-        while len(self._ctrl_stack) > self.domain._depth:
-            self._pop_ctrl()
+        for domain, domain_cases in per_domain.items():
+            if len(domain_cases) != len(switch_cases):
+                domain_cases = {patterns: domain_cases.get(patterns, [])
+                                for patterns in switch_cases}
+
+            self._statements[domain].append(Switch(switch_test, domain_cases,
+                src_loc=src_loc, case_src_locs=switch_case_src_locs))
+
+    def _finish_fsm(self, data):
+        src_loc = data["src_loc"]
+        fsm_name, fsm_init, fsm_encoding, fsm_decoding, fsm_states, fsm_ongoing = \
+            data["name"], data["init"], data["encoding"], data["decoding"], data["states"], data["ongoing"]
+        fsm_state_src_locs = data["state_src_locs"]
+        if not fsm_states:
+            data["signal"] = Signal(0, name=f"{fsm_name}_state", src_loc_at=3)
+            return
+        if fsm_init is None:
+            init = fsm_encoding[next(iter(fsm_states))]
+        else:
+            init = fsm_encoding[fsm_init]
+        # The FSM is encoded such that the state with encoding 0 is always the init state.
+        fsm_decoding.update((n, s) for s, n in fsm_encoding.items())
+        data["signal"] = fsm_signal = Signal(range(len(fsm_encoding)), init=init,
+                                             name=f"{fsm_name}_state", src_loc_at=3,
+                                             decoder=lambda n: f"{fsm_decoding[n]}/{n}")
+
+        for name, sig in fsm_ongoing.items():
+            self._top_comb_statements.append(
+                sig.eq(Operator("==", [fsm_signal, fsm_encoding[name]], src_loc_at=0)))
+
+        # Look up each state's encoding exactly once; it is reused below for the case maps
+        # and the case source locations.
+        state_codes = []
+        per_domain = {}
+        for state, stmts in fsm_states.items():
+            code = fsm_encoding[state]
+            state_codes.append((state, code))
+            for domain, domain_stmts in stmts.items():
+                per_domain.setdefault(domain, {})[code] = domain_stmts
+
+        state_src_locs = {code: fsm_state_src_locs[state] for state, code in state_codes}
+        for domain, domain_cases in per_domain.items():
+            if len(domain_cases) != len(state_codes):
+                domain_cases = {code: domain_cases.get(code, [])
+                                for state, code in state_codes}
+
+            self._statements[domain].append(Switch(fsm_signal, domain_cases,
+                src_loc=src_loc, case_src_locs=state_src_locs))
+
+    _CTRL_FINALIZERS = {"If": _finish_if, "Switch": _finish_switch, "FSM": _finish_fsm}
 
-        for stmt in Statement.cast(assigns):
-            if not isinstance(stmt, (Assign, Property, Print, _LateBoundStatement)):
+    def _add_statement(self, assigns, domain, depth):
+        cur_depth = self.domain._depth
+        if len(self._ctrl_stack) > cur_depth:
+            self._pop_ctrl_to(cur_depth)
+
+        if type(assigns) is Assign:
+            # The overwhelmingly common `m.d.<domain> += sig.eq(...)` case: no need to walk
+            # a nested iterable just to wrap one assignment.
+            stmts = (assigns,)
+        else:
+            stmts = Statement.cast(assigns)
+            if not stmts:
+                return
+        # Fetched only once the first statement passes validation, so a rejected statement
+        # does not leave an empty bucket behind for the domain.
+        domain_stmts = None
+        driving_ids = self._driving_ids
+        for stmt in stmts:
+            # `Assign` is final, so the identity check covers every assignment; the tuple
+            # isinstance is only reached for the much rarer statement kinds.
+            is_assign = type(stmt) is Assign
+            if not is_assign and not isinstance(stmt, _STATEMENT_TYPES):
                 raise SyntaxError(
                     f"Only assignments, prints, and property checks may be appended to d.{domain}")
 
             stmt._MustUse__used = True
 
-            if isinstance(stmt, Assign):
+            if is_assign:
                 for signal in stmt._lhs_signals():
-                    if signal not in self._driving:
-                        self._driving[signal] = domain
-                    elif self._driving[signal] != domain:
-                        cd_curr = self._driving[signal]
+                    if type(signal) is Signal:
+                        # Plain signals compare by identity, so the id-keyed dict gives the
+                        # same answer as `_driving` without the `SignalKey` wrapping.
+                        cd_curr = driving_ids.get(id(signal))
+                        if cd_curr is None:
+                            driving_ids[id(signal)] = domain
+                            self._driving[signal] = domain
+                            continue
+                    else:
+                        # `ClockSignal`/`ResetSignal` compare by clock domain, not identity;
+                        # they must go through the `SignalDict` lookup.
+                        cd_curr = self._driving.get(signal)
+                        if cd_curr is None:
+                            self._driving[signal] = domain
+                            continue
+                    if cd_curr != domain:
                         raise SyntaxError(
                             f"Driver-driver conflict: trying to drive {signal!r} from d.{domain}, but it is "
                             f"already driven from d.{cd_curr}")
 
-            self._statements.setdefault(domain, []).append(stmt)
+            if domain_stmts is None:
+                domain_stmts = self._statements[domain]
+            domain_stmts.append(stmt)
 
     def _add_submodule(self, submodule, name=None, src_loc=None):
         if not hasattr(submodule, "elaborate"):
@@ -626,8 +884,7 @@ class Module(_ModuleBuilderRoot, Elaboratable):
         self._domains[cd.name] = cd
 
     def _flush(self):
-        while self._ctrl_stack:
-            self._pop_ctrl()
+        self._pop_ctrl_to(0)
 
     def elaborate(self, platform):
         self._flush()
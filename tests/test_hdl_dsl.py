@@ -78,6 +78,15 @@ class DSLTestCase(FHDLTestCase):
             m.d.comb += self.c1.eq(1)
             m.d.sync += self.c1.eq(1)
 
+    def test_d_conflict_clock_signal(self):
+        # Distinct ClockSignal objects for the same domain are equal drivers.
+        m = Module()
+        with self.assertRaisesRegex(SyntaxError,
+                (r"^Driver-driver conflict: trying to drive \(clk pix\) from d\.sync, but it "
+                    r"is already driven from d\.comb$")):
+            m.d.comb += ClockSignal("pix").eq(self.c1)
+            m.d.sync += ClockSignal("pix").eq(self.c2)
+
     def test_d_wrong(self):
         m = Module()
         with self.assertRaisesRegex(AttributeError,
@@ -603,8 +612,6 @@ class DSLTestCase(FHDLTestCase):
                 )
                 (case 1 )
             )
-            (eq (sig) (== (sig fsm_state) (const 1'd0)))
-            (eq (sig) (== (sig fsm_state) (const 1'd1)))
         )
         """)
         self.assertRepr(frag.statements["sync"], """
@@ -627,7 +634,6 @@ class DSLTestCase(FHDLTestCase):
             "(sig a)": "comb",
             "(sig fsm_state)": "sync",
             "(sig b)": "sync",
-            "(sig)": "comb",
         })
         fsm  = frag.find_generated("fsm")
         self.assertIsInstance(fsm.state, Signal)
@@ -658,8 +664,6 @@ class DSLTestCase(FHDLTestCase):
                 )
                 (case 1 )
             )
-            (eq (sig) (== (sig fsm_state) (const 1'd0)))
-            (eq (sig) (== (sig fsm_state) (const 1'd1)))
         )
         """)
         self.assertRepr(frag.statements["sync"], """
@@ -696,8 +700,6 @@ class DSLTestCase(FHDLTestCase):
                 )
                 (case 1 )
             )
-            (eq (sig) (== (sig fsm_state) (const 1'd0)))
-            (eq (sig) (== (sig fsm_state) (const 1'd1)))
         )
         """)
         self.assertRepr(frag.statements["sync"], """
@@ -749,6 +751,24 @@ class DSLTestCase(FHDLTestCase):
         )
         """)
 
+    def test_FSM_ongoing_post_finalize(self):
+        a = Signal()
+        m = Module()
+        with m.FSM() as fsm:
+            with m.State("FIRST"):
+                m.next = "SECOND"
+            with m.State("SECOND"):
+                pass
+        # Querying a state after the FSM block still yields a driven signal.
+        m.d.comb += a.eq(fsm.ongoing("SECOND"))
+        frag = m.elaborate(platform=None)
+        self.assertRepr(frag.statements["comb"], """
+        (
+            (eq (sig a) (sig))
+            (eq (sig) (== (sig fsm_state) (const 1'd1)))
+        )
+        """)
+
     def test_FSM_empty(self):
         m = Module()
         with m.FSM():